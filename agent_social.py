@@ -1,23 +1,34 @@
 import os
-import subprocess
-import sys
-import textwrap
+import re
 from datetime import datetime
 
-# Optional: requests installieren (stabiler als curl parsing)
+# requests (stabiler als curl parsing) kommt aus requirements.txt
 try:
     import requests
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "requests"])
-    import requests
+except ImportError as e:
+    raise RuntimeError("Missing dep: pip install requests") from e
 
 
 SKILL_URL = os.getenv("MOLTBOOK_SKILL_URL", "https://moltbook.com/skill.md")
 ADVICE_PATH = os.getenv("SOCIAL_ADVICE_PATH", "social_advice.txt")
 WORKER_REPORT_PATH = os.getenv("WORKER_REPORT_PATH", "worker_report.txt")
+WORKER_REPORT_MAX_BYTES = int(os.getenv("WORKER_REPORT_MAX_BYTES", "120000"))
 
 SOCIAL_POST_ENABLED = os.getenv("SOCIAL_POST_ENABLED", "0").strip() == "1"
 
+# Failure-Mode Marker, einmal beim Import kompiliert (case-insensitive, kein .lower() Kopie).
+# Eine Alternation mit benannten Gruppen → ein einziger Pass über den Report.
+FAILURE_MARKER_RE = re.compile(
+    r"(?P<zero>no actions produced|clicks: 0|types: 0)"
+    r"|(?P<disconnect>browser not connected|websocket connection closed)"
+    r"|(?P<login>login)"
+    r"|(?P<success>success)",
+    re.IGNORECASE,
+)
+
+# Zeilen, die nur aus Spaces/Tabs bestehen (gleiches Muster wie textwrap.dedent)
+WHITESPACE_ONLY_LINE_RE = re.compile(r"^[ \t]+$", re.MULTILINE)
+
 
 def fetch_skill_md(url: str) -> str:
     # "curl -s" wäre auch ok, aber requests gibt klarere Fehler
@@ -26,12 +37,15 @@ def fetch_skill_md(url: str) -> str:
     return r.text
 
 
-def read_worker_report(path: str) -> str:
+def read_worker_report(path: str, max_bytes: int = WORKER_REPORT_MAX_BYTES) -> str:
+    # Nur bis max_bytes lesen: ein riesiger Report soll nicht komplett im Speicher landen
     if not os.path.exists(path):
         return ""
     try:
-        return open(path, "r", encoding="utf-8").read()
-    except Exception:
+        with open(path, "rb") as f:
+            data = f.read(max_bytes)
+        return data.decode("utf-8", errors="ignore")
+    except OSError:
         return ""
 
 
@@ -41,13 +55,18 @@ def summarize_failure_mode(worker_report: str) -> str:
     - erkennt "0 clicks/types" oder "browser not connected"
     - liefert 1-2 Sätze Einordnung
     """
-    lower = worker_report.lower()
-
-    if "no actions produced" in lower or "clicks: 0" in lower or "types: 0" in lower:
+    found = set()
+    for m in FAILURE_MARKER_RE.finditer(worker_report):
+        found.add(m.lastgroup)
+        if m.lastgroup == "zero":
+            # höchste Priorität, Rest des Reports egal
+            break
+
+    if "zero" in found:
         return "Failure-Mode: ZERO-ACTIONS (LLM hat keine Tool-Actions generiert)."
-    if "browser not connected" in lower or "websocket connection closed" in lower:
+    if "disconnect" in found:
         return "Failure-Mode: DISCONNECT (Steel/CDP Verbindung abgerissen)."
-    if "login" in lower and "success" in lower:
+    if "login" in found and "success" in found:
         return "Failure-Mode: NACH-LOGIN-STEP (Login ok, danach Navigation/Click instabil)."
 
     return "Failure-Mode: UNKLAR (keine eindeutigen Marker gefunden)."
@@ -80,29 +99,30 @@ def build_advice(skill_md: str, worker_report: str) -> str:
         excerpt = worker_report.strip()
         if len(excerpt) > 1200:
             excerpt = excerpt[:1200] + "\n...[truncated]..."
-
-    advice = f"""\
-# SOCIAL ADVICE (für Worker Memory Injection)
-Timestamp: {datetime.utcnow().isoformat()}Z
-{failure_mode}
-{skill_hint}
-
-## Priorisierte Maßnahmen (testbar)
-- {base_guard[0]}
-- {base_guard[1]}
-- {base_guard[2]}
-- {base_guard[3]}
-- {base_guard[4]}
-
-## Beobachteter Worker-Report (Excerpt)
-{excerpt if excerpt else "(kein worker_report.txt gefunden)"}
-"""
-    return textwrap.dedent(advice).strip() + "\n"
+        # wie zuvor textwrap.dedent: Zeilen nur aus Whitespace werden leer
+        excerpt = WHITESPACE_ONLY_LINE_RE.sub("", excerpt)
+
+    lines = [
+        "# SOCIAL ADVICE (für Worker Memory Injection)",
+        f"Timestamp: {datetime.utcnow().isoformat()}Z",
+        failure_mode,
+        skill_hint,
+        "",
+        "## Priorisierte Maßnahmen (testbar)",
+        *(f"- {g}" for g in base_guard),
+        "",
+        "## Beobachteter Worker-Report (Excerpt)",
+        excerpt if excerpt else "(kein worker_report.txt gefunden)",
+    ]
+    return "\n".join(lines) + "\n"
 
 
 def write_advice(path: str, advice: str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(advice)
+    # Atomar: erst .tmp schreiben, dann os.replace → Worker liest nie eine halbe Datei
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(advice.encode("utf-8"))
+    os.replace(tmp, path)
 
 
 def maybe_post_to_moltbook(advice: str) -> None:
@@ -0,0 +1,180 @@
+import asyncio
+import copy
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import agent_core  # noqa: E402
+
+
+def _history(*outputs):
+    return SimpleNamespace(history=[SimpleNamespace(model_output=o, error=None) for o in outputs])
+
+
+class FakeContext:
+    async def storage_state(self, path=None):
+        state = {"cookies": [{"name": "sid", "value": "x"}], "origins": []}
+        if path is not None:
+            Path(path).write_text(json.dumps(state))
+        return state
+
+
+class FakeSession:
+    """Verhalten von browser-use 0.2.7 BrowserSession, soweit der Worker es nutzt."""
+
+    def __init__(self, cdp_url=None, **kwargs):
+        self.cdp_url = cdp_url
+        self.browser_profile = SimpleNamespace(keep_alive=None, **kwargs)
+        self.initialized = False
+        self.browser_context = None
+        self.stopped = False
+        self.killed = False
+
+    def model_copy(self):
+        # flache Kopie: browser_profile + browser_context werden geteilt
+        return copy.copy(self)
+
+    async def start(self):
+        # CDP-Verbindung zu einem fremden Browser → keep_alive=True, falls nicht gesetzt
+        if self.browser_profile.keep_alive is None:
+            self.browser_profile.keep_alive = True
+        self.browser_context = FakeContext()
+        self.initialized = True
+
+    async def stop(self):
+        if self.browser_profile.keep_alive:
+            return
+        self.stopped = True
+        self.browser_context = None
+        self.initialized = False
+
+    async def close(self):
+        await self.stop()
+
+    async def kill(self):
+        self.browser_profile.keep_alive = False
+        await self.stop()
+        self.killed = True
+
+
+class FakeAgent:
+    # Pro run() ein Eintrag: "act" (Klick + Login ok), "idle" (0 Aktionen), "hang"
+    script = []
+
+    def __init__(self, task, llm, browser, use_vision):
+        if browser.browser_profile.keep_alive and not browser.initialized:
+            raise ValueError("BrowserSession with keep_alive=True must be initialized before passing to Agent.")
+        self.browser_session = browser.model_copy()
+
+    async def run(self):
+        if not self.browser_session.initialized:
+            await self.browser_session.start()
+        try:
+            mode = self.script.pop(0)
+            if mode == "hang":
+                await asyncio.sleep(3600)
+            action = [{"click_element_by_index": {"index": 1}}] if mode == "act" else []
+            text = "login: ok" if mode == "act" else ""
+            return SimpleNamespace(
+                history=[SimpleNamespace(model_output=SimpleNamespace(action=action), error=None)],
+                final_result=lambda: text,
+            )
+        finally:
+            await self.browser_session.stop()
+
+
+def _fake_modules(sessions):
+    def browser(**kwargs):
+        session = FakeSession(**kwargs)
+        sessions.append(session)
+        return session
+
+    browser_use = ModuleType("browser_use")
+    browser_use.Browser = browser
+    browser_use.Agent = FakeAgent
+    langchain_groq = ModuleType("langchain_groq")
+    langchain_groq.ChatGroq = lambda **kwargs: SimpleNamespace(**kwargs)
+    httpx = ModuleType("httpx")
+    httpx.Limits = httpx.Timeout = lambda *args, **kwargs: None
+
+    class AsyncClient:
+        def __init__(self, **kwargs):
+            pass
+
+        async def aclose(self):
+            pass
+
+    httpx.AsyncClient = AsyncClient
+    return {"browser_use": browser_use, "langchain_groq": langchain_groq, "httpx": httpx}
+
+
+class AnalyzeHistoryTest(unittest.TestCase):
+    def test_tool_calls_count_by_name(self):
+        output = SimpleNamespace(
+            action=None,
+            tool_calls=[
+                {"name": "click_element_by_index", "args": {"index": 3}, "id": "call_1", "type": "tool_call"},
+                {"name": "go_to_url", "args": {"url": "https://example.org"}, "id": "call_2", "type": "tool_call"},
+            ],
+        )
+        telemetry = agent_core.analyze_history(_history(output))
+        self.assertEqual(telemetry.clicks, 1)
+        self.assertEqual(telemetry.navigates, 1)
+        # "type" ist ein Feld des Tool-Calls, keine Action
+        self.assertEqual(telemetry.types, 0)
+
+    def test_action_dicts_count_by_key(self):
+        output = SimpleNamespace(action=[{"input_text": {"index": 1, "text": "x"}}])
+        telemetry = agent_core.analyze_history(_history(output))
+        self.assertEqual(telemetry.types, 1)
+
+
+class RunWithRetriesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sessions = []
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.auth_state = Path(tmp.name) / "storage_state.json"
+        for patcher in (
+            mock.patch.dict(sys.modules, _fake_modules(self.sessions)),
+            mock.patch.object(agent_core, "WORKER_RETRY_BACKOFF_SEC", 0),
+            mock.patch.object(agent_core, "AUTH_STATE_PATH", str(self.auth_state)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_retry_reuses_started_session(self):
+        # Attempt 1 ohne Aktionen → Attempt 2 auf derselben Session darf nicht am keep_alive scheitern
+        FakeAgent.script = ["idle", "act"]
+        result, telemetry = await agent_core.run_with_retries("task", max_attempts=2)
+        self.assertEqual(result, "login: ok")
+        self.assertEqual(telemetry.clicks, 1)
+        self.assertEqual(len(self.sessions), 1)
+        # Aufräumen trennt die Session trotz keep_alive=True
+        self.assertTrue(self.sessions[0].killed)
+
+    async def test_timed_out_session_is_closed(self):
+        FakeAgent.script = ["hang", "act"]
+        with mock.patch.object(agent_core, "WORKER_TIMEOUT_SEC", 0.05):
+            result, _ = await agent_core.run_with_retries("task", max_attempts=2)
+        self.assertEqual(result, "login: ok")
+        self.assertEqual(len(self.sessions), 2)
+        # Gehängte Session wurde im Hintergrund wirklich getrennt, der Retry lief auf einer neuen
+        self.assertTrue(self.sessions[0].stopped)
+        self.assertTrue(self.sessions[1].killed)
+
+    async def test_login_ok_saves_auth_state(self):
+        FakeAgent.script = ["act"]
+        await agent_core.run_with_retries("task", max_attempts=1)
+        # Gespeichert wird über die Session aus run_with_retries, nicht über die Kopie des Agents
+        self.assertEqual(json.loads(self.auth_state.read_text())["cookies"][0]["name"], "sid")
+
+
+if __name__ == "__main__":
+    unittest.main()